@@ -2,6 +2,12 @@
 ctypes-based wrappers for the functions exposed by arti-rpc-client-core.
 
 These wrappers deliberately do as little as possible.
+
+(We use ctypes, rather than cffi or a compiled extension module,
+so that this package has no build step and no dependencies
+outside the standard library,
+and so that the location of the shared library
+can be chosen at runtime.)
 """
 
 from __future__ import annotations
@@ -20,6 +26,7 @@ from ctypes import (
 
 import os
 import sys
+from typing import Any, Optional
 
 ##########
 # Declare some types for use with ctypes.
@@ -51,10 +58,19 @@ class ArtiRpcHandle(Structure):
 
 ArtiRpcResponseType = c_int
 
-_ConnOut = POINTER(POINTER(ArtiRpcConn))
-_ErrorOut = POINTER(POINTER(ArtiRpcError))
-_RpcStrOut = POINTER(POINTER(ArtiRpcStr))
-_RpcHandleOut = POINTER(POINTER(ArtiRpcHandle))
+# Pointer types.
+#
+# We construct these once here, so that callers
+# don't need to call POINTER() on every request.
+ArtiRpcStrPtr = POINTER(ArtiRpcStr)
+ArtiRpcConnPtr = POINTER(ArtiRpcConn)
+ArtiRpcErrorPtr = POINTER(ArtiRpcError)
+ArtiRpcHandlePtr = POINTER(ArtiRpcHandle)
+
+_ConnOut = POINTER(ArtiRpcConnPtr)
+_ErrorOut = POINTER(ArtiRpcErrorPtr)
+_RpcStrOut = POINTER(ArtiRpcStrPtr)
+_RpcHandleOut = POINTER(ArtiRpcHandlePtr)
 _ArtiRpcResponseTypeOut = POINTER(ArtiRpcResponseType)
 
 _ArtiRpcStatus = c_uint32
@@ -79,80 +95,80 @@ else:
 ##########
 # Tell ctypes about the function signatures.
 
+# Map from the name of each function we use to its (restype, argtypes).
+#
+# (We keep these in a table, rather than assigning `.restype` and `.argtypes`
+# by hand, since ctypes silently accepts misspelled attributes
+# like `.argtype`, and then does no argument conversion at all.
+# `_LazyLibrary` applies them as each function is first used.)
+_SIGNATURES: dict[str, tuple[Any, list]] = {
+    "arti_rpc_conn_open_stream": (
+        _ArtiRpcStatus,
+        [
+            ArtiRpcConnPtr,
+            c_char_p,
+            c_int,
+            c_char_p,
+            c_char_p,
+            POINTER(_ArtiRpcRawSocket),
+            _RpcStrOut,
+            _ErrorOut,
+        ],
+    ),
+    "arti_rpc_conn_execute": (
+        _ArtiRpcStatus,
+        [ArtiRpcConnPtr, c_char_p, _RpcStrOut, _ErrorOut],
+    ),
+    "arti_rpc_conn_execute_with_handle": (
+        _ArtiRpcStatus,
+        [ArtiRpcConnPtr, c_char_p, _RpcHandleOut, _ErrorOut],
+    ),
+    "arti_rpc_conn_get_session_id": (c_char_p, [ArtiRpcConnPtr]),
+    "arti_rpc_connect": (_ArtiRpcStatus, [c_char_p, _ConnOut, _ErrorOut]),
+    "arti_rpc_conn_free": (None, [ArtiRpcConnPtr]),
+    "arti_rpc_err_free": (None, [ArtiRpcErrorPtr]),
+    "arti_rpc_err_message": (c_char_p, [ArtiRpcErrorPtr]),
+    "arti_rpc_err_os_error_code": (c_int, [ArtiRpcErrorPtr]),
+    "arti_rpc_err_response": (c_char_p, [ArtiRpcErrorPtr]),
+    "arti_rpc_err_status": (_ArtiRpcStatus, [ArtiRpcErrorPtr]),
+    "arti_rpc_handle_free": (None, [ArtiRpcHandlePtr]),
+    "arti_rpc_handle_wait": (
+        _ArtiRpcStatus,
+        [ArtiRpcHandlePtr, _RpcStrOut, _ArtiRpcResponseTypeOut, _ErrorOut],
+    ),
+    "arti_rpc_status_to_str": (c_char_p, [_ArtiRpcStatus]),
+    "arti_rpc_str_free": (None, [ArtiRpcStrPtr]),
+    "arti_rpc_str_get": (c_char_p, [ArtiRpcStrPtr]),
+}
+
+
+class _LazyLibrary:
+    """
+    Wrapper around a ctypes dll for arti-rpc-client-core.
 
-def _annotate_library(lib: ctypes.CDLL):
-    """Helper: annotate a ctypes dll `lib` with appropriate function signatures."""
-    lib.arti_rpc_conn_open_stream.restype = _ArtiRpcStatus
-    lib.arti_rpc_conn_open_stream.argtypes = [
-        POINTER(ArtiRpcConn),
-        c_char_p,
-        c_int,
-        c_char_p,
-        c_char_p,
-        POINTER(_ArtiRpcRawSocket),
-        _RpcStrOut,
-        _ErrorOut,
-    ]
-
-    lib.arti_rpc_conn_execute.argtypes = [
-        POINTER(ArtiRpcConn),
-        c_char_p,
-        _RpcStrOut,
-        _ErrorOut,
-    ]
-    lib.arti_rpc_conn_execute.restype = _ArtiRpcStatus
-
-    lib.arti_rpc_conn_execute_with_handle.argtypes = [
-        POINTER(ArtiRpcConn),
-        c_char_p,
-        _RpcHandleOut,
-        _ErrorOut,
-    ]
-    lib.arti_rpc_conn_execute_with_handle.restype = _ArtiRpcStatus
-
-    lib.arti_rpc_conn_get_session_id.argtypes = [POINTER(ArtiRpcConn)]
-    lib.arti_rpc_conn_get_session_id.restype = c_char_p
-
-    lib.arti_rpc_connect.argtypes = [c_char_p, _ConnOut, _ErrorOut]
-    lib.arti_rpc_connect.restype = _ArtiRpcStatus
-
-    lib.arti_rpc_conn_free.argtypes = [POINTER(ArtiRpcConn)]
-    lib.arti_rpc_conn_free.restype = None
-
-    lib.arti_rpc_err_free.argtypes = [POINTER(ArtiRpcError)]
-    lib.arti_rpc_err_free.restype = None
-
-    lib.arti_rpc_err_message.argtypes = [POINTER(ArtiRpcError)]
-    lib.arti_rpc_err_message.restype = c_char_p
-
-    lib.arti_rpc_err_os_error_code.argtypes = [POINTER(ArtiRpcError)]
-    lib.arti_rpc_err_os_error_code.restype = c_int
-
-    lib.arti_rpc_err_response.argtypes = [POINTER(ArtiRpcError)]
-    lib.arti_rpc_err_response.restype = c_char_p
-
-    lib.arti_rpc_err_status.argtypes = [POINTER(ArtiRpcError)]
-    lib.arti_rpc_err_status.restype = _ArtiRpcStatus
-
-    lib.arti_rpc_handle_free.argtypes = [POINTER(ArtiRpcHandle)]
-    lib.arti_rpc_handle_free.restype = None
+    We annotate each function with its signature from `_SIGNATURES`
+    the first time it is looked up, so that programs only pay
+    for the functions they actually use.
+    """
 
-    lib.arti_rpc_handle_wait.argtypes = [
-        POINTER(ArtiRpcHandle),
-        _RpcStrOut,
-        _ArtiRpcResponseTypeOut,
-        _ErrorOut,
-    ]
-    lib.arti_rpc_handle_wait.restype = _ArtiRpcStatus
+    _lib: ctypes.CDLL
 
-    lib.arti_rpc_status_to_str.argtypes = [_ArtiRpcStatus]
-    lib.arti_rpc_status_to_str.restype = c_char_p
+    def __init__(self, lib: ctypes.CDLL):
+        self._lib = lib
 
-    lib.arti_rpc_str_free.argtypes = [POINTER(ArtiRpcStr)]
-    lib.arti_rpc_str_free.restype = None
+    def __getattr__(self, name: str):
+        # Python only calls this method when `name` isn't already set
+        # on this object, so we only annotate each function once.
+        try:
+            restype, argtypes = _SIGNATURES[name]
+        except KeyError:
+            raise AttributeError(name) from None
 
-    lib.arti_rpc_str_get.argtypes = [POINTER(ArtiRpcStr)]
-    lib.arti_rpc_str_get.restype = c_char_p
+        func = getattr(self._lib, name)
+        func.restype = restype
+        func.argtypes = argtypes
+        setattr(self, name, func)
+        return func
 
 
 def _load_library():
@@ -161,6 +177,12 @@ def _load_library():
     First, look in the path in $LIBARTI_RPC_CLIENT_CORE (if it is
     set).  Otherwise, use the default path from LoadLibrary.
 
+    (We load the library as a CDLL, not a PyDLL,
+    so that ctypes releases the GIL whenever we call into it.
+    Several of our functions block on network IO
+    (arti_rpc_connect, arti_rpc_conn_execute, arti_rpc_handle_wait,
+    arti_rpc_conn_open_stream, ...),
+    so holding the GIL would stall every other Python thread.)
     """
     p = os.environ.get("LIBARTI_RPC_CLIENT_CORE")
     if p is not None:
@@ -179,10 +201,10 @@ def _load_library():
     return ctypes.cdll.LoadLibrary(libname)
 
 
-_THE_LIBRARY = None
+_THE_LIBRARY: Optional[_LazyLibrary] = None
 
 
-def get_library() -> ctypes.CDLL:
+def get_library() -> _LazyLibrary:
     """Try to find the shared library, loading it if needed.
 
     By default, we use the ctypes library's notion of the standard
@@ -195,7 +217,6 @@ def get_library() -> ctypes.CDLL:
     if _THE_LIBRARY is not None:
         return _THE_LIBRARY
 
-    lib = _load_library()
-    _annotate_library(lib)
+    lib = _LazyLibrary(_load_library())
     _THE_LIBRARY = lib
     return lib
@@ -15,19 +15,26 @@ from __future__ import annotations
 
 # Design notes:
 #
-# - Every object gets a reference to the ctypes library object
+# - Every object gets a reference to the library object
 #   from the `ffi` module.
 #   We do this to better support programs that want exact control
 #   over how the library is loaded.
 #
 # - Exported types start with "Arti", to make imports safer.
+#
+# - We pass output arguments (like `ffi.ArtiRpcStrPtr()`) directly,
+#   without wrapping them in `byref()`:
+#   when a function's argtype is a pointer to some type,
+#   ctypes passes instances of that type by reference automatically.
 
 import json
 import logging
 import os
 import socket
 import sys
-from ctypes import POINTER, byref, c_int, _Pointer as Ptr
+import threading
+import time
+from ctypes import _Pointer as Ptr
 from enum import Enum
 import arti_rpc.ffi
 from arti_rpc.ffi import (
@@ -36,8 +43,12 @@ from arti_rpc.ffi import (
     ArtiRpcHandle as FfiHandle,
     ArtiRpcConn as FfiConn,
     _ArtiRpcStatus as FfiStatus,
+    _ArtiRpcRawSocket as FfiRawSocket,
 )
 from typing import (
+    Any,
+    Callable,
+    Iterable,
     Optional,
     Tuple,
     Union,
@@ -56,22 +67,96 @@ else:
         return sock >= 0
 
 
+# Functions to encode an object as a UTF-8 json string,
+# and to decode a json string.
+_json_dumps: Callable[[Any], bytes]
+_json_loads: Callable[[Union[str, bytes]], Any]
+
+try:
+    # orjson is a good deal faster than the standard json module,
+    # so we use it when it's installed.
+    import orjson
+
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+
+    def _std_json_dumps(o: Any) -> bytes:
+        """Encode `o` as a UTF-8 json string, using the standard json module."""
+        return json.dumps(o).encode("utf-8")
+
+    _json_dumps = _std_json_dumps
+    _json_loads = json.loads
+
 _logger = logging.getLogger(__name__)
 
+# How long may a released connection sit unused in the pool
+# before `ArtiRpcConn.acquire` stops handing it out?
+CONN_POOL_IDLE_TIMEOUT = 60.0
+
+# Connections returned with `ArtiRpcConn.release`,
+# keyed by (connect_string, rpc_lib).
+#
+# Each list holds (time_released, connection) pairs,
+# oldest first.
+#
+# (We only read the time while holding _CONN_POOL_LOCK,
+# so that the lists stay in order.)
+_CONN_POOL: dict[tuple, list[tuple[float, ArtiRpcConn]]] = {}
+_CONN_POOL_LOCK = threading.Lock()
+
+
+def _take_stale_conns(now: float) -> list[ArtiRpcConn]:
+    """
+    Remove every connection from _CONN_POOL that has been idle
+    for at least CONN_POOL_IDLE_TIMEOUT seconds as of `now`,
+    and return them.
+
+    The caller must hold _CONN_POOL_LOCK,
+    and should close the returned connections after releasing it.
+    """
+    stale: list[ArtiRpcConn] = []
+    for key in list(_CONN_POOL):
+        idle = _CONN_POOL[key]
+        n_stale = 0
+        for released_at, _ in idle:
+            if now - released_at < CONN_POOL_IDLE_TIMEOUT:
+                break
+            n_stale += 1
+        stale.extend(conn for (_, conn) in idle[:n_stale])
+        del idle[:n_stale]
+        if not idle:
+            del _CONN_POOL[key]
+    return stale
+
 
 class _RpcBase:
+    __slots__ = ("_rpc",)
+
     def __init__(self, rpc_lib):
         self._rpc = rpc_lib
 
-    def _consume_rpc_str(self, s: Ptr[FfiStr]) -> str:
+    def _consume_rpc_bytes(self, s: Ptr[FfiStr]) -> bytes:
         """
-        Consume an ffi.ArtiRpcStr and return a python string.
+        Consume an ffi.ArtiRpcStr and return its contents as python bytes.
+
+        (The bytes are guaranteed to be valid UTF-8.)
         """
+        # This takes two calls into the library, but we can't fold them
+        # into one: ctypes copies the c_char_p result of arti_rpc_str_get
+        # into a `bytes` only after the call returns,
+        # so the string must still be alive at that point.
+        rpc = self._rpc
         try:
-            bs = self._rpc.arti_rpc_str_get(s)
-            return bs.decode("utf-8")
+            return rpc.arti_rpc_str_get(s)
         finally:
-            self._rpc.arti_rpc_str_free(s)
+            rpc.arti_rpc_str_free(s)
+
+    def _consume_rpc_str(self, s: Ptr[FfiStr]) -> str:
+        """
+        Consume an ffi.ArtiRpcStr and return a python string.
+        """
+        return self._consume_rpc_bytes(s).decode("utf-8")
 
     def _handle_error(self, rv: FfiStatus, error_ptr: Ptr[FfiError]) -> None:
         """
@@ -84,20 +169,23 @@ class _RpcBase:
         (No other object was constructed and needs to be freed.)
         """
         if rv != 0:
-            raise ArtiRpcError(rv, error_ptr, self._rpc)
+            raise ArtiRpcError._from_ffi(rv, error_ptr, self._rpc)
         elif error_ptr:
             # This should be impossible; it indicates misbehavior on arti's part.
-            raise ArtiRpcError(rv, error_ptr, self._rpc)
+            raise ArtiRpcError._from_ffi(rv, error_ptr, self._rpc)
 
 
-def _into_json_str(o: Union[str, dict]) -> str:
+def _into_json_bytes(o: Union[str, bytes, dict]) -> bytes:
     """
-    If 'o' is a dict, convert it into a json string.
+    If 'o' is a dict, convert it into a UTF-8 encoded json string.
+    If it is a str, encode it as UTF-8.
 
     Otherwise return it as-is.
     """
     if isinstance(o, dict):
-        return json.dumps(o)
+        return _json_dumps(o)
+    elif isinstance(o, str):
+        return o.encode("utf-8")
     else:
         return o
 
@@ -107,30 +195,50 @@ class ArtiRpcConn(_RpcBase):
     An open connection to Arti.
     """
 
+    __slots__ = (
+        "_conn",
+        "_session",
+        "_fn_execute",
+        "_fn_execute_with_handle",
+        "_connect_string",
+        "_in_pool",
+        "_from_pool",
+    )
+
     _conn: Optional[Ptr[FfiConn]]
     _session: ArtiRpcObject
+    _fn_execute: Callable
+    _fn_execute_with_handle: Callable
+    _connect_string: str
+    _in_pool: bool
+    _from_pool: bool
 
     def __init__(self, connect_string: str, rpc_lib=None):
         """
         Try to connect to Arti, using the parameters specified in
         `connect_str`.
 
-        If `rpc_lib` is specified, it must be a ctypes DLL,
-        constructed with `arti_rpc.ffi.get_library`.
+        If `rpc_lib` is specified, it must be a library object
+        returned by `arti_rpc.ffi.get_library`.
         If it's None, we use the default.
         """
         self._conn = None
+        self._connect_string = connect_string
+        self._in_pool = False
+        self._from_pool = False
 
         if rpc_lib is None:
             rpc_lib = arti_rpc.ffi.get_library()
 
         _RpcBase.__init__(self, rpc_lib)
 
-        conn = POINTER(arti_rpc.ffi.ArtiRpcConn)()
-        error = POINTER(arti_rpc.ffi.ArtiRpcError)()
-        rv = self._rpc.arti_rpc_connect(
-            connect_string.encode("utf-8"), byref(conn), byref(error)
-        )
+        # We look these up once here, since we call them on every request.
+        self._fn_execute = rpc_lib.arti_rpc_conn_execute
+        self._fn_execute_with_handle = rpc_lib.arti_rpc_conn_execute_with_handle
+
+        conn = arti_rpc.ffi.ArtiRpcConnPtr()
+        error = arti_rpc.ffi.ArtiRpcErrorPtr()
+        rv = self._rpc.arti_rpc_connect(connect_string.encode("utf-8"), conn, error)
         self._handle_error(rv, error)
         assert conn
         self._conn = conn
@@ -138,11 +246,108 @@ class ArtiRpcConn(_RpcBase):
         self._session = self.make_object(s)
 
     def __del__(self):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close this connection to Arti.
+
+        The caller must not use this connection after closing it.
+
+        (Connections are closed automatically when they are dropped,
+        but each connection is part of a reference cycle with its session,
+        so that may not happen until the garbage collector runs.)
+        """
         if self._conn is not None:
             # Note that if _conn is set, then _rpc is necessarily set.
             self._rpc.arti_rpc_conn_free(self._conn)
             self._conn = None
 
+    def __enter__(self) -> ArtiRpcConn:
+        return self
+
+    def __exit__(self, *args):
+        # Connections from `acquire` go back to the pool;
+        # any others are closed.
+        if self._from_pool:
+            self.release()
+        else:
+            self.close()
+
+    @classmethod
+    def acquire(cls, connect_string: str, rpc_lib=None) -> ArtiRpcConn:
+        """
+        Return a connection to Arti using the parameters in `connect_string`.
+
+        If a connection with the same `connect_string` and `rpc_lib`
+        has been returned with `release` within the last
+        `CONN_POOL_IDLE_TIMEOUT` seconds, reuse it.
+        Otherwise, open a new connection, as `ArtiRpcConn()` would.
+
+        Leaving a `with` block on the returned connection
+        releases it back to the pool.
+
+        Idle connections are closed the next time
+        `acquire` or `release` is called after they expire,
+        or when `drain_pool` is called.
+        """
+        if rpc_lib is None:
+            rpc_lib = arti_rpc.ffi.get_library()
+
+        found = None
+        with _CONN_POOL_LOCK:
+            stale = _take_stale_conns(time.monotonic())
+            idle = _CONN_POOL.get((connect_string, rpc_lib))
+            while idle and found is None:
+                _, conn = idle.pop()
+                # Skip any connections that were closed while in the pool.
+                if conn._conn is not None:
+                    found = conn
+                    found._in_pool = False
+
+        # We close the stale connections now that we no longer hold the lock,
+        # so that doing so doesn't block other threads.
+        for conn in stale:
+            conn.close()
+
+        if found is None:
+            found = cls(connect_string, rpc_lib)
+        found._from_pool = True
+        return found
+
+    def release(self) -> None:
+        """
+        Return this connection to the pool used by `ArtiRpcConn.acquire`,
+        so that a later caller can reuse it.
+
+        The caller must not use this connection after releasing it.
+        """
+        if self._conn is None or self._in_pool:
+            return
+
+        with _CONN_POOL_LOCK:
+            now = time.monotonic()
+            stale = _take_stale_conns(now)
+            idle = _CONN_POOL.setdefault((self._connect_string, self._rpc), [])
+            idle.append((now, self))
+            self._in_pool = True
+
+        # As in `acquire`, we close the stale connections outside the lock.
+        for conn in stale:
+            conn.close()
+
+    @classmethod
+    def drain_pool(cls) -> None:
+        """
+        Close every connection in the pool used by `ArtiRpcConn.acquire`.
+        """
+        with _CONN_POOL_LOCK:
+            idle = [conn for conns in _CONN_POOL.values() for (_, conn) in conns]
+            _CONN_POOL.clear()
+
+        for conn in idle:
+            conn.close()
+
     def make_object(self, object_id: str) -> ArtiRpcObject:
         """
         Return an ArtiRpcObject for a given object ID on this connection.
@@ -162,7 +367,7 @@ class ArtiRpcConn(_RpcBase):
         """
         return self._session
 
-    def execute(self, request: Union[str, dict]) -> dict:
+    def execute(self, request: Union[str, bytes, dict]) -> dict:
         """
         Run an RPC request on this connection.
 
@@ -172,21 +377,22 @@ class ArtiRpcConn(_RpcBase):
         You may (and probably should) omit the `id` field from your request.
         If you do, a new id will be automatically generated.
 
-        The request may be a string, or a dict that will be encoded
-        as a json object.
+        The request may be a string, a UTF-8 encoded bytes,
+        or a dict that will be encoded as a json object.
         """
-        msg = _into_json_str(request)
-        response = POINTER(arti_rpc.ffi.ArtiRpcStr)()
-        error = POINTER(arti_rpc.ffi.ArtiRpcError)()
-        rv = self._rpc.arti_rpc_conn_execute(
-            self._conn, msg.encode("utf-8"), byref(response), byref(error)
-        )
+        msg = _into_json_bytes(request)
+        response = arti_rpc.ffi.ArtiRpcStrPtr()
+        error = arti_rpc.ffi.ArtiRpcErrorPtr()
+        rv = self._fn_execute(self._conn, msg, response, error)
         self._handle_error(rv, error)
-        r = ArtiRpcResponse(self._consume_rpc_str(response))
-        assert r.kind() == ArtiRpcResponseKind.RESULT
-        return r["result"]
+        # arti_rpc_conn_execute only succeeds with a final result,
+        # so we parse the response directly
+        # rather than wrapping it in an ArtiRpcResponse.
+        return _json_loads(self._consume_rpc_bytes(response))["result"]
 
-    def execute_with_handle(self, request: Union[str, dict]) -> ArtiRequestHandle:
+    def execute_with_handle(
+        self, request: Union[str, bytes, dict]
+    ) -> ArtiRequestHandle:
         """
         Launch an RPC request on this connection, and return a ArtiRequestHandle
         to the open request.
@@ -194,15 +400,29 @@ class ArtiRpcConn(_RpcBase):
         This API is suitable for use when you want incremental updates
         about the request status.
         """
-        msg = _into_json_str(request)
-        handle = POINTER(arti_rpc.ffi.ArtiRpcHandle)()
-        error = POINTER(arti_rpc.ffi.ArtiRpcError)()
-        rv = self._rpc.arti_rpc_conn_execute_with_handle(
-            self._conn, msg.encode("utf-8"), byref(handle), byref(error)
-        )
+        msg = _into_json_bytes(request)
+        handle = arti_rpc.ffi.ArtiRpcHandlePtr()
+        error = arti_rpc.ffi.ArtiRpcErrorPtr()
+        rv = self._fn_execute_with_handle(self._conn, msg, handle, error)
         self._handle_error(rv, error)
         return ArtiRequestHandle(handle, self._rpc)
 
+    def execute_many(
+        self, requests: Iterable[Union[str, bytes, dict]]
+    ) -> list[ArtiRpcResponse]:
+        """
+        Run several RPC requests on this connection.
+
+        All of the requests are launched before we wait for any of them,
+        so that Arti can work on them concurrently.
+
+        Return the final response (a result or an error)
+        to each request, in the same order as `requests`.
+        Incremental updates are discarded.
+        """
+        handles = [self.execute_with_handle(request) for request in requests]
+        return [handle._wait_final() for handle in handles]
+
     def open_stream(
         self,
         hostname: str,
@@ -233,12 +453,11 @@ class ArtiRpcConn(_RpcBase):
         isolation: bytes = isolation.encode("utf-8")
         on_object: Optional[bytes] = _opt_object_id_to_bytes(on_object)
         if want_stream_id:
-            stream_id = POINTER(arti_rpc.ffi.ArtiRpcStr)()
-            stream_id_ptr = byref(stream_id)
+            stream_id = arti_rpc.ffi.ArtiRpcStrPtr()
         else:
-            stream_id_ptr = None
-        sock_cint = c_int(arti_rpc.ffi.INVALID_SOCKET)
-        error = POINTER(arti_rpc.ffi.ArtiRpcError)()
+            stream_id = None
+        sock = FfiRawSocket(arti_rpc.ffi.INVALID_SOCKET)
+        error = arti_rpc.ffi.ArtiRpcErrorPtr()
 
         rv = self._rpc.arti_rpc_conn_open_stream(
             self._conn,
@@ -246,20 +465,20 @@ class ArtiRpcConn(_RpcBase):
             port,
             on_object,
             isolation,
-            byref(sock_cint),
-            stream_id_ptr,
-            byref(error),
+            sock,
+            stream_id,
+            error,
         )
         self._handle_error(rv, error)
 
-        assert _socket_is_valid(sock_cint.value)
-        sock = socket.socket(fileno=sock_cint.value)
+        assert _socket_is_valid(sock.value)
+        pysock = socket.socket(fileno=sock.value)
 
-        if want_stream_id:
+        if stream_id is not None:
             stream_id_obj = self.make_object(self._consume_rpc_str(stream_id))
-            return (sock, stream_id_obj)
+            return (pysock, stream_id_obj)
         else:
-            return (sock, None)
+            return (pysock, None)
 
 
 class ArtiRpcErrorStatus(Enum):
@@ -306,25 +525,67 @@ class ArtiRpcError(Exception):
     An error returned by the RPC library.
     """
 
+    __slots__ = (
+        "_rv",
+        "_status",
+        "_status_str",
+        "_message",
+        "_os_error_code",
+        "_response",
+    )
+
     _rv: FfiStatus
-    _err: Ptr[FfiError]
+    _status: int
+    _status_str: str
+    _message: Optional[str]
+    _os_error_code: int
+    _response: Optional[bytes]
 
-    def __init__(self, rv: FfiStatus, err: Ptr[FfiError], rpc):
+    def __init__(
+        self,
+        rv: FfiStatus,
+        status: int,
+        status_str: str,
+        message: Optional[str],
+        os_error_code: int,
+        response: Optional[bytes],
+    ):
+        # Note that these arguments all become `self.args`,
+        # so they must be plain python values:
+        # `copy` and `pickle` rebuild the exception from them.
         self._rv = rv
-        self._err = err
-        self._rpc = rpc
+        self._status = status
+        self._status_str = status_str
+        self._message = message
+        self._os_error_code = os_error_code
+        self._response = response
 
-    def __del__(self):
-        if self._err is not None:
-            self._rpc.arti_rpc_err_free(self._err)
-            self._err = None
+    @classmethod
+    def _from_ffi(cls, rv: FfiStatus, err: Ptr[FfiError], rpc) -> ArtiRpcError:
+        """
+        Construct a new ArtiRpcError from the library error `err`,
+        and free `err`.
+
+        We copy everything we need out of `err` right away,
+        so that inspecting or formatting this error
+        doesn't need to call into the library again.
+        """
+        try:
+            status = rpc.arti_rpc_err_status(err)
+            status_str = rpc.arti_rpc_status_to_str(status).decode("utf-8")
+            message = rpc.arti_rpc_err_message(err)
+            if message is not None:
+                message = message.decode("utf-8")
+            os_error_code = rpc.arti_rpc_err_os_error_code(err)
+            response = rpc.arti_rpc_err_response(err)
+        finally:
+            rpc.arti_rpc_err_free(err)
+        return cls(rv, status, status_str, message, os_error_code, response)
 
     def __str__(self):
-        status = self._rpc.arti_rpc_status_to_str(
-            self._rpc.arti_rpc_err_status(self._err)
-        ).decode("utf-8")
-        msg = self._rpc.arti_rpc_err_message(self._err).decode("utf-8")
-        if status == msg:
+        status = self._status_str
+        msg = self._message
+        if msg is None or status == msg:
             return status
         else:
             return f"{status}: {msg}"
@@ -335,14 +596,14 @@ class ArtiRpcError(Exception):
 
         This code is generated by the underlying RPC library.
         """
-        return _error_status_from_int(self._rpc.arti_rpc_err_status(self._err))
+        return _error_status_from_int(self._status)
 
     def os_error_code(self) -> Optional[int]:
         """
         Return the OS error code (e.g., errno) associated with this error,
         if there is one.
         """
-        code = self._rpc.arti_rpc_err_os_code(self._rpc._err)
+        code = self._os_error_code
         if code == 0:
             return None
         else:
@@ -353,7 +614,7 @@ class ArtiRpcError(Exception):
         Return the RPC response string associated with this error,
         if this error represents an error message from the RPC server.
         """
-        response = self._rpc.arti_rpc_err_response(self._err)
+        response = self._response
         if response is None:
             return None
         else:
@@ -364,11 +625,12 @@ class ArtiRpcError(Exception):
         Return the RPC error object associated with this error,
         if this error represents an error message from the RPC server.
         """
-        response = self.response_str()
+        response = self._response
         if response is None:
             return None
         else:
-            return json.loads(response)["error"]
+            # The json parser accepts bytes, so we don't decode them ourselves.
+            return _json_loads(response)["error"]
 
 
 def _opt_object_id_to_bytes(
@@ -391,10 +653,14 @@ class ArtiRpcObject(_RpcBase):
     used to launch RPC requests ergonomically.
     """
 
+    __slots__ = ("_id", "_conn", "_owned", "_meta", "_id_json", "_prefix_cache")
+
     _id: str
     _conn: ArtiRpcConn
     _owned: bool
     _meta: Optional[dict]
+    _id_json: bytes
+    _prefix_cache: dict[str, bytes]
 
     def __init__(self, object_id: str, connection: ArtiRpcConn):
         _RpcBase.__init__(self, connection._rpc)
@@ -402,6 +668,10 @@ class ArtiRpcObject(_RpcBase):
         self._conn = connection
         self._owned = True
         self._meta = None
+        self._id_json = _json_dumps(object_id)
+        # Map from method name to the encoded start of a request
+        # for that method on this object, up to the start of its params.
+        self._prefix_cache = {}
 
     def id(self) -> str:
         """
@@ -409,26 +679,54 @@ class ArtiRpcObject(_RpcBase):
         """
         return self._id
 
+    def _request(self, method: str, params: dict) -> bytes:
+        """
+        Return an encoded request to invoke `method` on this object
+        with `params`.
+        """
+        # We build the request by hand, so that we only have to encode
+        # the object ID and the method name once.
+        prefix = self._prefix_cache.get(method)
+        if prefix is None:
+            method_json = _json_dumps(method)
+            prefix = (
+                b'{"obj":' + self._id_json + b',"method":' + method_json + b',"params":'
+            )
+            self._prefix_cache[method] = prefix
+        params_json = _json_dumps(params)
+        if self._meta is None:
+            return prefix + params_json + b"}"
+        else:
+            meta_json = _json_dumps(self._meta)
+            return prefix + params_json + b',"meta":' + meta_json + b"}"
+
     def invoke(self, method: str, **params) -> dict:
         """
         Invoke a given RPC method with a given set of parameters,
         wait for it to complete,
         and return its result as a json object.
         """
-        request = {"obj": self._id, "method": method, "params": params}
-        if self._meta is not None:
-            request["meta"] = self._meta
-        return self._conn.execute(json.dumps(request))
+        return self._conn.execute(self._request(method, params))
 
     def invoke_with_handle(self, method: str, **params):
         """
         Invoke a given RPC method with a given set of parameters,
         and return an RpcHandle that can be used to check its progress.
         """
-        request = {"obj": self._id, "method": method, "params": params}
-        if self._meta is not None:
-            request["meta"] = self._meta
-        return self._conn.execute_with_handle(json.dumps(request))
+        return self._conn.execute_with_handle(self._request(method, params))
+
+    def invoke_many(self, calls: Iterable[Tuple[str, dict]]) -> list[ArtiRpcResponse]:
+        """
+        Invoke several RPC methods on this object, as with
+        `ArtiRpcConn.execute_many`.
+
+        Each member of `calls` is a `(method, params)` tuple.
+
+        Return the final response to each call, in order.
+        """
+        return self._conn.execute_many(
+            self._request(method, params) for (method, params) in calls
+        )
 
     def with_meta(self, **params) -> ArtiRpcObject:
         """
@@ -444,6 +742,7 @@ class ArtiRpcObject(_RpcBase):
         """
         new_obj = ArtiRpcObject(self._id, self._conn)
         new_obj._owned = False
+        new_obj._prefix_cache = self._prefix_cache
         if params:
             new_obj._meta = params
         else:
@@ -485,6 +784,17 @@ class ArtiRpcResponseKind(Enum):
     ERROR = 3
 
 
+# Map from ARTI_RPC_RESPONSE_TYPE_* values to ArtiRpcResponseKind.
+#
+# (Indexing this is much faster than calling `ArtiRpcResponseKind(value)`.)
+_RESPONSE_KINDS = (
+    None,
+    ArtiRpcResponseKind.RESULT,
+    ArtiRpcResponseKind.UPDATE,
+    ArtiRpcResponseKind.ERROR,
+)
+
+
 class ArtiRpcResponse:
     """
     A response from the RPC server.
@@ -494,13 +804,21 @@ class ArtiRpcResponse:
     or an error.
     """
 
+    __slots__ = ("_kind", "_response", "_obj")
+
     _kind: ArtiRpcResponseKind
-    _response: str
+    _response: Union[str, bytes]
     _obj: dict
 
-    def __init__(self, response: str):
+    def __init__(self, response: Union[str, bytes]):
+        """
+        Parse `response`, which must be a UTF-8 JSON object.
+
+        (We accept `bytes` so that we can hand responses from the RPC library
+        straight to the JSON parser; we only decode them if `str` is called.)
+        """
         self._response = response
-        self._obj = json.loads(response)
+        self._obj = _json_loads(response)
 
         have_result = "result" in self._obj
         have_error = "error" in self._obj
@@ -521,6 +839,8 @@ class ArtiRpcResponse:
             assert False
 
     def __str__(self):
+        if isinstance(self._response, bytes):
+            self._response = self._response.decode("utf-8")
         return self._response
 
     def __getitem__(self, key: str):
@@ -557,6 +877,8 @@ class ArtiRequestHandle(_RpcBase):
     Handle to a pending RPC request.
     """
 
+    __slots__ = ("_handle",)
+
     _handle: Ptr[FfiHandle]
 
     def __init__(self, handle: Ptr[FfiHandle], rpc):
@@ -575,14 +897,24 @@ class ArtiRequestHandle(_RpcBase):
 
         Return the response received.
         """
-        response = POINTER(arti_rpc.ffi.ArtiRpcStr)()
+        response = arti_rpc.ffi.ArtiRpcStrPtr()
         responsetype = arti_rpc.ffi.ArtiRpcResponseType(0)
-        error = POINTER(arti_rpc.ffi.ArtiRpcError)()
-        rv = self._rpc.arti_rpc_handle_wait(
-            self._handle, byref(response), byref(responsetype), byref(error)
-        )
+        error = arti_rpc.ffi.ArtiRpcErrorPtr()
+        rv = self._rpc.arti_rpc_handle_wait(self._handle, response, responsetype, error)
         self._handle_error(rv, error)
-        response_obj = ArtiRpcResponse(self._consume_rpc_str(response))
-        expected_kind = ArtiRpcResponseKind(responsetype.value)
+        response_obj = ArtiRpcResponse(self._consume_rpc_bytes(response))
+        expected_kind = _RESPONSE_KINDS[responsetype.value]
         assert response_obj.kind() == expected_kind
         return response_obj
+
+    def _wait_final(self) -> ArtiRpcResponse:
+        """
+        Wait for a final response (an error or a result) on this handle,
+        discarding any updates.
+
+        Return the response received.
+        """
+        while True:
+            response = self.wait()
+            if response.kind() != ArtiRpcResponseKind.UPDATE:
+                return response
@@ -75,13 +75,18 @@ class TestContext:
         self.arti_process = ArtiProcess(subprocess.Popen(args))
         self._wait_for_rpc()
 
+    def rpc_connect_string(self) -> str:
+        """
+        Return a connect string that can be used to reach Arti over RPC.
+        """
+        # TODO RPC: This design will change; see #1528 and !2439
+        return f"unix:{self.socket_path}"
+
     def open_rpc_connection(self) -> arti_rpc.ArtiRpcConn:
         """
         Open an RPC connection to Arti.
         """
-        # TODO RPC: This design will change; see #1528 and !2439
-        connect_string = f"unix:{self.socket_path}"
-        return arti_rpc.ArtiRpcConn(connect_string)
+        return arti_rpc.ArtiRpcConn(self.rpc_connect_string())
 
     def arti_process_is_running(self) -> bool:
         """
@@ -19,6 +19,7 @@ _TEST_MODS = [
     "basic",
     "connect",
     "meta_features",
+    "pool",
     "release_obj",
 ]
 
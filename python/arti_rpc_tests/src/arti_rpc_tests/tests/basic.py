@@ -54,3 +54,32 @@ def test_execute_with_handle(context):
     except ArtiRpcError as e:
         assert e.status_code() == ArtiRpcErrorStatus.REQUEST_COMPLETED
         assert str(e) == "Request has already completed (or failed)"
+
+
+@arti_test
+def test_execute_many(context):
+    connection = context.open_rpc_connection()
+    session = connection.session()
+
+    req = {
+        "obj": session.id(),
+        "method": "arti:get_rpc_proxy_info",
+        "params": {},
+    }
+    bad_req = {
+        "obj": "zaphodbeeblebrox",
+        "method": "arti:get_rpc_proxy_info",
+        "params": {},
+    }
+    responses = connection.execute_many([req, bad_req, json.dumps(req)])
+    assert len(responses) == 3
+    assert responses[0].kind() == ArtiRpcResponseKind.RESULT
+    assert len(responses[0].result()["proxies"]) > 0
+    assert responses[1].kind() == ArtiRpcResponseKind.ERROR
+    assert "rpc:ObjectNotFound" in responses[1].error()["kinds"]
+    assert responses[2].kind() == ArtiRpcResponseKind.RESULT
+
+    responses = session.invoke_many(
+        [("arti:get_rpc_proxy_info", {}), ("arti:get_rpc_proxy_info", {})]
+    )
+    assert [r.kind() for r in responses] == [ArtiRpcResponseKind.RESULT] * 2
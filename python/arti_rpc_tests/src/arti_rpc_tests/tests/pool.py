@@ -0,0 +1,61 @@
+from arti_rpc_tests import arti_test
+from arti_rpc import ArtiRpcConn
+
+
+@arti_test
+def reuse_released_conn(context):
+    connect_string = context.rpc_connect_string()
+
+    conn_1 = ArtiRpcConn.acquire(connect_string)
+    conn_1.release()
+    # Releasing twice has no effect.
+    conn_1.release()
+
+    conn_2 = ArtiRpcConn.acquire(connect_string)
+    assert conn_2 is conn_1
+
+    # The pool is empty now, so we get a new connection.
+    conn_3 = ArtiRpcConn.acquire(connect_string)
+    assert conn_3 is not conn_2
+
+    result = conn_2.session().invoke("arti:get_rpc_proxy_info")
+    assert len(result["proxies"]) > 0
+
+
+@arti_test
+def release_with_context_manager(context):
+    connect_string = context.rpc_connect_string()
+
+    with ArtiRpcConn.acquire(connect_string) as conn_1:
+        result = conn_1.session().invoke("arti:get_rpc_proxy_info")
+        assert len(result["proxies"]) > 0
+
+    with ArtiRpcConn.acquire(connect_string) as conn_2:
+        assert conn_2 is conn_1
+
+
+@arti_test
+def with_unpooled_conn_closes(context):
+    connect_string = context.rpc_connect_string()
+
+    with ArtiRpcConn(connect_string) as conn_1:
+        pass
+    assert conn_1._conn is None
+
+    # Since conn_1 was closed, it wasn't put into the pool.
+    conn_2 = ArtiRpcConn.acquire(connect_string)
+    assert conn_2 is not conn_1
+    conn_2.release()
+
+
+@arti_test
+def drain_pool(context):
+    connect_string = context.rpc_connect_string()
+
+    conn_1 = ArtiRpcConn.acquire(connect_string)
+    conn_1.release()
+    ArtiRpcConn.drain_pool()
+    assert conn_1._conn is None
+
+    conn_2 = ArtiRpcConn.acquire(connect_string)
+    assert conn_2 is not conn_1